@@ -1,21 +1,77 @@
+import os
+from urllib.parse import urlencode
+
 import countries
 import streamlit as st
 import pandas as pd
-import preprocessor
+import dataset
+import figures
+import forecast
 import helper
+import matrices
+import preprocessor
+import search
+import tables
+import shared
 import plotly.express as px
 import plotly.figure_factory as ff
 import seaborn as sns
 import matplotlib.pyplot as plt
+import timing
 from helper import weight_v_height,men_vs_women
 
 
 st.set_page_config(layout="wide")
+timing.reset()
+
+
+# The preprocessed frame is shared by every session and only rebuilt when the data changes.
+# With OLYMPICS_SHARED_DIR set, workers map the frame published by `shared.py publish`.
+@st.cache_resource(show_spinner="Loading Olympic data...", max_entries=1)
+def load_dataset(data_version):
+    if shared.SHARED_DIR:
+        return shared.attach(version=data_version)
+    return dataset.load()
+
+
+df, data_version = load_dataset(shared.current_version() if shared.SHARED_DIR else dataset.version())
+
+
+@st.cache_resource(max_entries=1)
+def load_medal_cube(data_version, _df):
+    return matrices.MedalCube.from_frame(_df)
+
+
+@st.cache_resource(max_entries=1)
+def load_athletes(data_version, _df):
+    return preprocessor.build_athletes(_df)
+
+
+athletes = load_athletes(data_version, df)
+
+
+@st.cache_resource(max_entries=1)
+def load_games(data_version, _df):
+    return preprocessor.build_games(_df), preprocessor.dataset_totals(_df)
+
+
+games, totals = load_games(data_version, df)
+
+
+@st.cache_resource(max_entries=1)
+def load_export_options(data_version, _df):
+    return {column: ['Overall'] + sorted(_df[column].dropna().unique().tolist())
+            for column in ('Year', 'region', 'Sport')}
 
-df = pd.read_csv(r'athlete_events.csv')
-region_df = pd.read_csv(r'noc_regions.csv')
 
-df = preprocessor.preprocess(df, region_df)
+@st.cache_resource(max_entries=1, show_spinner="Fitting medal forecasts...")
+def load_forecast(data_version, _df):
+    return forecast.load_or_fit(_df, data_version)
+
+
+@st.cache_resource(max_entries=1)
+def load_athlete_index(data_version, _df, _athletes):
+    return search.AthleteIndex(_df, _athletes)
 
 # Sidebar configuration
 st.sidebar.title("Olympics Analysis")
@@ -23,15 +79,16 @@ st.sidebar.image(
     'https://e7.pngegg.com/pngimages/1020/402/png-clipart-2024-summer-olympics-brand-circle-area-olympic-rings-olympics-logo-text-sport.png')
 user_menu = st.sidebar.radio(
     'Select an Option',
-    ('Medal Tally', 'Overall Analysis', 'Country-wise Analysis', 'Athlete-wise Analysis',
-     'Top Athletes', 'Olympic Games Locations', 'Olympics Trivia', 'Predictions')
+    ('Medal Tally', 'Overall Analysis', 'Country-wise Analysis', 'Country Comparison', 'Athlete-wise Analysis',
+     'Athlete Search', 'Top Athletes', 'Olympic Games Locations', 'Olympics Trivia', 'Predictions')
 )
 
 # Medal Tally Section
 if user_menu == 'Medal Tally':
     try:
         with st.spinner("Loading Medal Data... Please wait!"):
-            years, countries = helper.country_year_list(df)
+            with timing.span('helper.country_year_list', rows_in=df):
+                years, countries = helper.country_year_list(df)
 
         # Sidebar Filters with Modern Design
         with st.sidebar:
@@ -39,7 +96,8 @@ if user_menu == 'Medal Tally':
             selected_year = st.selectbox("📅 Select Year", years, key='year_select')
             selected_country = st.selectbox("🌍 Select Country", countries, key='country_select')
 
-        medal_tally = helper.fetch_medal_tally(df, selected_year, selected_country)
+        with timing.span('helper.fetch_medal_tally', rows_in=df) as s:
+            medal_tally = s.rows(helper.fetch_medal_tally(df, selected_year, selected_country))
 
         if 'Total' not in medal_tally.columns:
             medal_tally['Total'] = medal_tally[['Gold', 'Silver', 'Bronze']].sum(axis=1)
@@ -97,62 +155,52 @@ if user_menu == 'Medal Tally':
         # Medal Tally Table with modern hover effect
         st.markdown("<hr style='border: 1px solid #ddd;'>", unsafe_allow_html=True)
 
-        # Stylish Medal Table with Hover Effects
-        styled_df = medal_tally.style \
-            .format({'Gold': '🥇 {}', 'Silver': '🥈 {}', 'Bronze': '🥉 {}', 'Total': '🏅 {}'}) \
-            .background_gradient(cmap='Blues', subset=['Total']) \
-            .set_properties(**{
-                'background-color': '#f8f8f8',
-                'color': '#1a237e',
-                'border-radius': '8px',
-                'font-size': '1.2rem',
-                'text-align': 'center',
-                'transition': 'all 0.3s ease',
-                'box-shadow': '0px 4px 8px rgba(0,0,0,0.1)',
-                'padding': '15px'
-            }) \
-            .set_table_styles([{
-                'selector': 'thead th',
-                'props': [('background-color', '#1a237e'), ('color', 'white'), ('font-size', '1.2rem'), ('padding', '15px'), ('font-weight', 'bold')]
-            }, {
-                'selector': 'tbody td',
-                'props': [('padding', '12px'), ('font-size', '1rem')]
-            }, {
-                'selector': 'tbody tr:hover',
-                'props': [('background-color', '#f1f8ff'), ('transform', 'scale(1.05)'), ('box-shadow', '0px 4px 8px rgba(0,0,0,0.2)')]
-            }])
-
-        st.dataframe(styled_df, height=450)
+        # Medal table: sorted and paged server-side, only the visible page is styled
+        with timing.span('render.medal_tally_table', rows_in=medal_tally):
+            tables.paged_table(
+                medal_tally.drop(columns='total'),
+                key='medal_tally',
+                gradient_column='Total',
+                column_config={
+                    'Gold': st.column_config.NumberColumn('Gold', format='🥇 %d'),
+                    'Silver': st.column_config.NumberColumn('Silver', format='🥈 %d'),
+                    'Bronze': st.column_config.NumberColumn('Bronze', format='🥉 %d'),
+                    'Total': st.column_config.NumberColumn('Total', format='🏅 %d'),
+                }
+            )
 
         # Medal Distribution Graph (Simple Pie Chart)
         st.markdown("<hr style='border: 1px solid #ddd;'>", unsafe_allow_html=True)
-        medal_data = medal_tally[['Gold', 'Silver', 'Bronze']].sum().reset_index()
-        medal_data.columns = ['Medal', 'Count']
-
-        color_map = {
-            "Gold": "#FFD700",
-            "Silver": "#C0C0C0",
-            "Bronze": "#CD7F32"
-        }
+        def build_medal_distribution_pie():
+            medal_data = medal_tally[['Gold', 'Silver', 'Bronze']].sum().reset_index()
+            medal_data.columns = ['Medal', 'Count']
+
+            color_map = {
+                "Gold": "#FFD700",
+                "Silver": "#C0C0C0",
+                "Bronze": "#CD7F32"
+            }
+
+            fig = px.pie(medal_data, names='Medal', values='Count', title='Medal Distribution', color='Medal', color_discrete_map=color_map)
+            fig.update_traces(textinfo='percent+label', pull=[0.1, 0.1, 0.1], hoverinfo='label+percent', opacity=0.8)
+
+            # Add Hover Effect to Pie Chart Segments
+            fig.update_traces(
+                hoverinfo="label+percent",
+                hovertemplate="<b>%{label}</b><br>Count: %{value}<br>%{percent}",
+                marker=dict(line=dict(color="white", width=2)),
+                opacity=0.85
+            )
 
-        fig = px.pie(medal_data, names='Medal', values='Count', title='Medal Distribution', color='Medal', color_discrete_map=color_map)
-        fig.update_traces(textinfo='percent+label', pull=[0.1, 0.1, 0.1], hoverinfo='label+percent', opacity=0.8)
+            fig.update_layout(
+                margin=dict(t=20, b=20, l=20, r=20),
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                hovermode="closest"
+            )
+            return fig
 
-        # Add Hover Effect to Pie Chart Segments
-        fig.update_traces(
-            hoverinfo="label+percent",
-            hovertemplate="<b>%{label}</b><br>Count: %{value}<br>%{percent}",
-            marker=dict(line=dict(color="white", width=2)),
-            opacity=0.85
-        )
-
-        fig.update_layout(
-            margin=dict(t=20, b=20, l=20, r=20),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            hovermode="closest"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        figures.render('medal_distribution_pie', build_medal_distribution_pie, (selected_year, selected_country), data_version, use_container_width=True)
 
         # Footer at the Bottom
         st.markdown("""
@@ -248,12 +296,13 @@ if user_menu == 'Overall Analysis':
 
     # Metric Cards
     metrics = [
-        ("📅 Editions", df['Year'].unique().shape[0] - 1, "#4CAF50"),
-        ("🏙️ Host Cities", df['City'].unique().shape[0], "#2196F3"),
-        ("⚽ Sports", df['Sport'].unique().shape[0], "#FF5722"),
-        ("🎯 Events", df['Event'].unique().shape[0], "#9C27B0"),
-        ("🌍 Nations", df['region'].unique().shape[0], "#E91E63"),
-        ("🏃 Athletes", df['Name'].unique().shape[0], "#009688")
+        # The 1906 Intercalated Games are not counted as an official edition
+        ("📅 Editions", int((games['Year'] != 1906).sum()), "#4CAF50"),
+        ("🏙️ Host Cities", games['City'].str.split(', ').explode().nunique(), "#2196F3"),
+        ("⚽ Sports", totals['Sports'], "#FF5722"),
+        ("🎯 Events", totals['Events'], "#9C27B0"),
+        ("🌍 Nations", totals['Nations'], "#E91E63"),
+        ("🏃 Athletes", totals['Athletes'], "#009688")
     ]
 
     # Metric Cards Styling and Layout
@@ -284,28 +333,32 @@ if user_menu == 'Overall Analysis':
         "<h2 style='color: #1a237e; border-bottom: 2px solid #0d47a1; padding-bottom: 0.5rem;'>🌐 Global Participation Trends</h2>",
         unsafe_allow_html=True)
 
-    nations_over_time = helper.participating_nations_over_time(df)
+    with timing.span('helper.participating_nations_over_time', rows_in=df) as s:
+        nations_over_time = s.rows(helper.participating_nations_over_time(df))
 
     col1, col2 = st.columns([2, 1])
     with col1:
         # Animated participation chart
-        fig = px.scatter(nations_over_time,
-                         x="Edition", y="Nations",
-                         animation_frame="Edition",
-                         size="Nations",
-                         color="Nations",
-                         color_continuous_scale=px.colors.sequential.Rainbow,
-                         range_y=[0, nations_over_time['Nations'].max() + 10],
-                         template="plotly_white+presentation",
-                         labels={'Nations': 'Participating Countries'},
-                         height=500)
-        fig.update_layout(
-            title="Animated Participation Growth",
-            xaxis_title="Olympic Edition",
-            yaxis_title="Number of Nations",
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_participation_scatter():
+            fig = px.scatter(nations_over_time,
+                             x="Edition", y="Nations",
+                             animation_frame="Edition",
+                             size="Nations",
+                             color="Nations",
+                             color_continuous_scale=px.colors.sequential.Rainbow,
+                             range_y=[0, nations_over_time['Nations'].max() + 10],
+                             template="plotly_white+presentation",
+                             labels={'Nations': 'Participating Countries'},
+                             height=500)
+            fig.update_layout(
+                title="Animated Participation Growth",
+                xaxis_title="Olympic Edition",
+                yaxis_title="Number of Nations",
+                hovermode="x unified"
+            )
+            return fig
+
+        figures.render('participation_scatter', build_participation_scatter, (), data_version, use_container_width=True)
 
     with col2:
         # Current participation metrics
@@ -318,19 +371,22 @@ if user_menu == 'Overall Analysis':
         """.format(nations_over_time['Nations'].iloc[-1]), unsafe_allow_html=True)
 
         # Cumulative growth chart
-        cumulative_df = nations_over_time.copy()
-        cumulative_df['Cumulative Nations'] = cumulative_df['Nations'].cumsum()
-        fig = px.area(cumulative_df, x="Edition", y="Cumulative Nations",
-                      template="plotly_white",
-                      color_discrete_sequence=["#00bfa5"],
-                      labels={'Cumulative Nations': 'Total Nations'},
-                      height=300)
-        fig.update_layout(
-            title="Cumulative Participation",
-            margin=dict(t=40, b=20),
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_cumulative_participation_area():
+            cumulative_df = nations_over_time.copy()
+            cumulative_df['Cumulative Nations'] = cumulative_df['Nations'].cumsum()
+            fig = px.area(cumulative_df, x="Edition", y="Cumulative Nations",
+                          template="plotly_white",
+                          color_discrete_sequence=["#00bfa5"],
+                          labels={'Cumulative Nations': 'Total Nations'},
+                          height=300)
+            fig.update_layout(
+                title="Cumulative Participation",
+                margin=dict(t=40, b=20),
+                showlegend=False
+            )
+            return fig
+
+        figures.render('cumulative_participation_area', build_cumulative_participation_area, (), data_version, use_container_width=True)
 
     st.markdown("---")
 
@@ -341,9 +397,8 @@ if user_menu == 'Overall Analysis':
 
     with st.spinner('Generating sports evolution matrix...'):
         fig, ax = plt.subplots(figsize=(20, 15))
-        pivot_data = df.drop_duplicates(['Year', 'Sport', 'Event']) \
-            .pivot_table(index='Sport', columns='Year', values='Event', aggfunc='count') \
-            .fillna(0).astype(int)
+        with timing.span('matrices.event_matrix', rows_in=df) as s:
+            pivot_data = s.rows(matrices.event_matrix(df))
 
         sns.heatmap(pivot_data, cmap="YlGnBu", annot=True, fmt="d",
                     linewidths=.5, ax=ax, cbar_kws={'label': 'Number of Events'})
@@ -352,7 +407,8 @@ if user_menu == 'Overall Analysis':
         ax.set_ylabel("Sports Category", labelpad=15, fontsize=12)
         ax.tick_params(axis='x', rotation=45, labelsize=10)
         ax.tick_params(axis='y', labelsize=10)
-        st.pyplot(fig)
+        with timing.span('render.sport_evolution_heatmap'):
+            st.pyplot(fig)
 
     st.markdown("---")
 
@@ -365,7 +421,8 @@ if user_menu == 'Overall Analysis':
     selected_sport = st.selectbox('Select Sport Discipline:', sport_list, key='athlete_sport')
 
     with st.spinner(f'Analyzing top performers in {selected_sport}...'):
-        top_athletes = helper.most_successful(df, selected_sport)
+        with timing.span('helper.most_successful', rows_in=df) as s:
+            top_athletes = s.rows(helper.most_successful(df, athletes, selected_sport))
 
         # Styled dataframe with medals
         st.dataframe(
@@ -406,7 +463,8 @@ if user_menu == 'Country-wise Analysis':
             f"{selected_country}'s Olympic Journey</h1></div>",
             unsafe_allow_html=True)
 
-        country_df = helper.yearwise_medal_tally(df, selected_country)
+        with timing.span('helper.yearwise_medal_tally', rows_in=df) as s:
+            country_df = s.rows(helper.yearwise_medal_tally(df, selected_country))
 
         # Ensure medal columns exist
         for medal in ['Gold', 'Silver', 'Bronze']:
@@ -415,19 +473,22 @@ if user_menu == 'Country-wise Analysis':
 
         col1, col2 = st.columns([3, 1])
         with col1:
-            fig = px.line(
-                country_df,
-                x="Year",
-                y="Medal",
-                markers=True,
-                color_discrete_sequence=["#1E88E5"],
-                template="plotly_white",
-                labels={'Medal': 'Total Medals'},
-                title=f"{selected_country}'s Medal Progression"
-            )
-            fig.update_layout(hovermode="x unified", title_font=dict(size=22), title_x=0.5)
-            fig.update_traces(marker=dict(size=8), line=dict(width=3))
-            st.plotly_chart(fig, use_container_width=True)
+            def build_country_medal_line():
+                fig = px.line(
+                    country_df,
+                    x="Year",
+                    y="Medal",
+                    markers=True,
+                    color_discrete_sequence=["#1E88E5"],
+                    template="plotly_white",
+                    labels={'Medal': 'Total Medals'},
+                    title=f"{selected_country}'s Medal Progression"
+                )
+                fig.update_layout(hovermode="x unified", title_font=dict(size=22), title_x=0.5)
+                fig.update_traces(marker=dict(size=8), line=dict(width=3))
+                return fig
+
+            figures.render('country_medal_line', build_country_medal_line, (selected_country,), data_version, use_container_width=True)
 
         with col2:
             st.markdown(f"""
@@ -453,7 +514,8 @@ if user_menu == 'Country-wise Analysis':
                     unsafe_allow_html=True)
 
         with st.spinner('Analyzing sport performance...'):
-            heatmap_data = helper.country_event_heatmap(df, selected_country)
+            with timing.span('matrices.medal_cube.heatmap', rows_in=df) as s:
+                heatmap_data = s.rows(load_medal_cube(data_version, df).heatmap(selected_country))
             fig, ax = plt.subplots(figsize=(18, 12))
             sns.heatmap(
                 heatmap_data,
@@ -466,13 +528,15 @@ if user_menu == 'Country-wise Analysis':
             ax.set_title(f"{selected_country}'s Medal Distribution by Sport and Year", pad=20)
             ax.set_xlabel("Olympic Year", labelpad=15)
             ax.set_ylabel("Sports Discipline", labelpad=15)
-            st.pyplot(fig)
+            with timing.span('render.country_sport_heatmap'):
+                st.pyplot(fig)
 
         # Top Athletes Section
         st.markdown(f"<h2 style='color:#1a237e;'>🌟 {selected_country}'s Olympic Legends</h2>",
                     unsafe_allow_html=True)
 
-        top_athletes = helper.most_successful_countrywise(df, selected_country)
+        with timing.span('helper.most_successful_countrywise', rows_in=df) as s:
+            top_athletes = s.rows(helper.most_successful_countrywise(df, selected_country))
 
         st.markdown("""
             <div style="background: linear-gradient(135deg, #1a237e, #6a1b9a); padding: 20px 0; border-radius: 12px; text-align: center;">
@@ -513,10 +577,114 @@ if user_menu == 'Country-wise Analysis':
         st.error(f"Error loading country data: {str(e)}")
         st.stop()
 
+# Country Comparison
+if user_menu == 'Country Comparison':
+    with st.sidebar:
+        st.title('🆚 Compare Countries')
+        country_list = sorted(df['region'].dropna().unique().tolist())
+        default_countries = [c for c in ['USA', 'UK', 'Germany', 'France', 'China'] if c in country_list]
+        selected_countries = st.multiselect(
+            'Select countries',
+            country_list,
+            default=default_countries,
+            help="All selected countries are computed in one grouped query"
+        )
+
+    st.markdown(
+        "<div style='text-align: center; padding: 40px; background: linear-gradient(45deg, #1a237e, #6a1b9a); border-radius: 15px;'>"
+        "<h1 style='color:white; font-size: 3rem; font-weight: bold;'>🆚 Country Comparison</h1></div>",
+        unsafe_allow_html=True)
+
+    if not selected_countries:
+        st.info("Select one or more countries in the sidebar to compare them.")
+    else:
+        comparison_key = tuple(sorted(selected_countries))
+
+        with timing.span('helper.compare_yearwise_medal_tally', rows_in=df) as s:
+            tally = s.rows(helper.compare_yearwise_medal_tally(df, selected_countries))
+
+        def build_comparison_medal_line():
+            fig = px.line(
+                tally,
+                x="Year",
+                y="Medal",
+                color="region",
+                markers=True,
+                template="plotly_white",
+                labels={'Medal': 'Total Medals', 'region': 'Country'},
+                title="Medal Progression"
+            )
+            fig.update_layout(hovermode="x unified", title_font=dict(size=22), title_x=0.5)
+            return fig
+
+        figures.render('comparison_medal_line', build_comparison_medal_line, comparison_key, data_version,
+                       use_container_width=True)
+
+        def build_comparison_medal_bar():
+            totals = tally.groupby('region')[['Gold', 'Silver', 'Bronze']].sum().reset_index()
+            fig = px.bar(
+                totals.melt(id_vars='region', var_name='Medal', value_name='Count'),
+                x='region',
+                y='Count',
+                color='Medal',
+                barmode='group',
+                color_discrete_map={'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32'},
+                template="plotly_white",
+                labels={'region': 'Country'},
+                title="All-time Medals"
+            )
+            return fig
+
+        figures.render('comparison_medal_bar', build_comparison_medal_bar, comparison_key, data_version,
+                       use_container_width=True)
+
+        st.markdown("<h2 style='color:#1a237e;'>🏅 Sport Specialization</h2>", unsafe_allow_html=True)
+
+        def build_comparison_sport_heatmap():
+            with timing.span('matrices.medal_cube.sport_totals') as s:
+                sport_totals = s.rows(load_medal_cube(data_version, df).sport_totals(selected_countries))
+            fig = px.imshow(
+                sport_totals,
+                color_continuous_scale="YlGnBu",
+                text_auto=True,
+                aspect="auto",
+                labels={'x': 'Sport', 'y': 'Country', 'color': 'Medals'}
+            )
+            fig.update_layout(height=200 + 40 * len(sport_totals))
+            return fig
+
+        figures.render('comparison_sport_heatmap', build_comparison_sport_heatmap, comparison_key, data_version,
+                       use_container_width=True)
+
+        st.markdown("<h2 style='color:#1a237e;'>🌟 Top Athletes</h2>", unsafe_allow_html=True)
+        with timing.span('helper.compare_top_athletes', rows_in=df) as s:
+            top_athletes = s.rows(helper.compare_top_athletes(df, athletes, selected_countries))
+        st.dataframe(
+            top_athletes,
+            column_config={
+                "region": "Country",
+                "Name": "Athlete Name",
+                "Sport": "Sport Discipline",
+                "Medals": st.column_config.NumberColumn("Total Medals", format="%d 🏅")
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+    # Footer for this section
+    st.markdown("""
+        <footer style="position: relative; bottom: 0; width: 100%; background-color: #1a237e; color: white; padding: 20px 0; text-align: center; box-shadow: 0 4px 10px rgba(0, 0, 0, 0.2); border-top: 3px solid #6a1b9a;">
+            <div style="background: linear-gradient(135deg, #1a237e, #6a1b9a); padding: 20px 0; border-radius: 12px; text-align: center;">
+                <p style="font-size: 1.2rem; font-weight: bold; color: white; margin: 0;">
+                    Developed by Umesh Pathak | 🌍 Olympic Medal Data
+                </p>
+                <p style="font-size: 1rem; color: white; margin: 5px 0;">&copy; 2025 All rights reserved.</p>
+            </div>
+        </footer>
+    """, unsafe_allow_html=True)
+
 # Athlete-wise Analysis
 if user_menu == 'Athlete-wise Analysis':
-    athlete_df = df.drop_duplicates(subset=['Name', 'region'])
-
     # Header with modern styling and background
     st.markdown("""
     <div style="text-align: center; margin-bottom: 3rem; background-color: #1a237e; padding: 30px; border-radius: 12px;">
@@ -533,28 +701,31 @@ if user_menu == 'Athlete-wise Analysis':
     </div>
     """, unsafe_allow_html=True)
 
-    age_data = {
-        '🏃 Overall': athlete_df['Age'].dropna(),
-        '🥇 Gold Medalists': athlete_df[athlete_df['Medal'] == 'Gold']['Age'].dropna(),
-        '🥈 Silver Medalists': athlete_df[athlete_df['Medal'] == 'Silver']['Age'].dropna(),
-        '🥉 Bronze Medalists': athlete_df[athlete_df['Medal'] == 'Bronze']['Age'].dropna()
-    }
-
-    fig = ff.create_distplot(
-        list(age_data.values()),
-        list(age_data.keys()),
-        colors=["#1E88E5", "#FFD700", "#C0C0C0", "#CD7F32"],
-        show_hist=False,
-        show_rug=False
-    )
-    fig.update_layout(
-        template="plotly_dark",  # Dark theme for modern look
-        plot_bgcolor="rgba(0,0,0,0)",
-        height=500,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        title="Age Distribution of Athletes by Medal Type"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def build_age_distribution():
+        age_data = {
+            '🏃 Overall': athletes['Age'].dropna(),
+            '🥇 Gold Medalists': helper.medalist_ages(df, 'Gold')['Age'],
+            '🥈 Silver Medalists': helper.medalist_ages(df, 'Silver')['Age'],
+            '🥉 Bronze Medalists': helper.medalist_ages(df, 'Bronze')['Age']
+        }
+
+        fig = ff.create_distplot(
+            list(age_data.values()),
+            list(age_data.keys()),
+            colors=["#1E88E5", "#FFD700", "#C0C0C0", "#CD7F32"],
+            show_hist=False,
+            show_rug=False
+        )
+        fig.update_layout(
+            template="plotly_dark",  # Dark theme for modern look
+            plot_bgcolor="rgba(0,0,0,0)",
+            height=500,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            title="Age Distribution of Athletes by Medal Type"
+        )
+        return fig
+
+    figures.render('age_distribution', build_age_distribution, (), data_version, use_container_width=True)
 
     # Sport-specific age distribution with modern image styling
     st.markdown("""
@@ -574,23 +745,25 @@ if user_menu == 'Athlete-wise Analysis':
               'Rhythmic Gymnastics', 'Rugby Sevens', 'Beach Volleyball',
               'Triathlon', 'Rugby', 'Polo', 'Ice Hockey']
 
-    gold_ages = [athlete_df[(athlete_df['Sport'] == sport) &
-                            (athlete_df['Medal'] == 'Gold')]['Age'].dropna()
-                 for sport in sports]
-
-    fig = ff.create_distplot(gold_ages, sports,
-                             colors=["#FFD700"] * len(sports),
-                             show_hist=False,
-                             show_rug=False)
-    fig.update_layout(
-        template="plotly_dark",
-        height=600,
-        showlegend=False,
-        xaxis_title="Age",
-        yaxis_title="Density",
-        title="Age Distribution of Gold Medalists by Sport"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def build_gold_age_by_sport():
+        gold = helper.medalist_ages(df, 'Gold')
+        gold_ages = [gold.loc[gold['Sport'] == sport, 'Age'] for sport in sports]
+
+        fig = ff.create_distplot(gold_ages, sports,
+                                 colors=["#FFD700"] * len(sports),
+                                 show_hist=False,
+                                 show_rug=False)
+        fig.update_layout(
+            template="plotly_dark",
+            height=600,
+            showlegend=False,
+            xaxis_title="Age",
+            yaxis_title="Density",
+            title="Age Distribution of Gold Medalists by Sport"
+        )
+        return fig
+
+    figures.render('gold_age_by_sport', build_gold_age_by_sport, (), data_version, use_container_width=True)
 
     # Height vs Weight analysis with more polished visuals
     st.markdown("""
@@ -603,7 +776,8 @@ if user_menu == 'Athlete-wise Analysis':
 
     sport_list = ['Overall'] + sorted(df['Sport'].unique().tolist())
     selected_sport = st.selectbox('Select Sport Discipline', sport_list, key='sport_select')
-    analysis_df = weight_v_height(df, selected_sport)
+    with timing.span('helper.weight_v_height', rows_in=athletes) as s:
+        analysis_df = s.rows(weight_v_height(athletes, selected_sport))
 
     fig, ax = plt.subplots(figsize=(10, 6))
     sns.scatterplot(
@@ -620,7 +794,8 @@ if user_menu == 'Athlete-wise Analysis':
     ax.set_xlabel("Weight (kg)", labelpad=15, fontsize=14, color='#1a237e')
     ax.set_ylabel("Height (cm)", labelpad=15, fontsize=14, color='#1a237e')
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    st.pyplot(fig)
+    with timing.span('render.height_weight_scatter'):
+        st.pyplot(fig)
 
     # Gender participation with enhanced visual style
     st.markdown("""
@@ -631,25 +806,29 @@ if user_menu == 'Athlete-wise Analysis':
     </div>
     """, unsafe_allow_html=True)
 
-    gender_data = men_vs_women(df)
-    fig = px.line(
-        gender_data.melt(id_vars='Year', var_name='Gender', value_name='Count'),
-        x='Year',
-        y='Count',
-        color='Gender',
-        color_discrete_map={'Male': '#1E88E5', 'Female': '#D81B60'},
-        markers=True,
-        template="plotly_dark"
-    )
-    fig.update_layout(
-        height=400,
-        xaxis_title="Olympic Year",
-        yaxis_title="Number of Athletes",
-        legend_title="Gender",
-        plot_bgcolor="rgba(0,0,0,0)",
-        title="Gender Participation Over the Years"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def build_gender_participation_line():
+        with timing.span('helper.men_vs_women', rows_in=athletes) as s:
+            gender_data = s.rows(men_vs_women(athletes))
+        fig = px.line(
+            gender_data.melt(id_vars='Year', var_name='Gender', value_name='Count'),
+            x='Year',
+            y='Count',
+            color='Gender',
+            color_discrete_map={'Male': '#1E88E5', 'Female': '#D81B60'},
+            markers=True,
+            template="plotly_dark"
+        )
+        fig.update_layout(
+            height=400,
+            xaxis_title="Olympic Year",
+            yaxis_title="Number of Athletes",
+            legend_title="Gender",
+            plot_bgcolor="rgba(0,0,0,0)",
+            title="Gender Participation Over the Years"
+        )
+        return fig
+
+    figures.render('gender_participation_line', build_gender_participation_line, (), data_version, use_container_width=True)
 
     # Footer at the Bottom
     st.markdown("""
@@ -663,6 +842,72 @@ if user_menu == 'Athlete-wise Analysis':
         </footer>
     """, unsafe_allow_html=True)
 
+# Athlete Search
+if user_menu == 'Athlete Search':
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 3rem; background-color: #1a237e; padding: 30px; border-radius: 12px;">
+        <img src="https://upload.wikimedia.org/wikipedia/commons/thumb/5/5c/Olympic_rings_without_rims.svg/1200px-Olympic_rings_without_rims.svg.png" 
+             width="200" style="margin-bottom: 1rem;">
+        <h1 style="color: white; font-size: 2.5rem; font-weight: bold; text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);">🔎 Athlete Search</h1>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with st.spinner('Building athlete index...'):
+        athlete_index = load_athlete_index(data_version, df, athletes)
+
+    query = st.text_input('Athlete name', placeholder='e.g. Phelps, Nadia Comaneci, usain')
+    with timing.span('search.suggest') as s:
+        suggestions = s.rows(athlete_index.suggest(query, limit=15))
+
+    if query and not suggestions:
+        st.info(f"No athletes found matching '{query}'.")
+
+    if suggestions:
+        athlete_id = st.selectbox('Matching athletes', suggestions, format_func=athlete_index.label)
+        athlete = athletes.loc[athlete_id]
+        with timing.span('search.profile') as s:
+            career = s.rows(athlete_index.profile(athlete_id))
+
+        st.markdown(f"<h2 style='color:#1a237e;'>🏅 {athlete['Name']}</h2>", unsafe_allow_html=True)
+        cols = st.columns(4)
+        cols[0].metric("🌍 Nation", athlete['region'] if isinstance(athlete['region'], str) else athlete['NOC'])
+        cols[1].metric("📅 Games", career['Games'].nunique())
+        cols[2].metric("🎯 Events", len(career))
+        cols[3].metric("🏅 Medals", f"{athlete['Gold']} / {athlete['Silver']} / {athlete['Bronze']}",
+                       help="Gold / Silver / Bronze")
+
+        def build_athlete_timeline():
+            timeline = career.assign(Medal=career['Medal'].fillna('No Medal'))
+            fig = px.scatter(
+                timeline,
+                x='Year',
+                y='Event',
+                color='Medal',
+                color_discrete_map={'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32', 'No Medal': '#757575'},
+                hover_data=['Games', 'City', 'Age'],
+                template="plotly_white",
+                title=f"{athlete['Name']}'s Career Timeline"
+            )
+            fig.update_traces(marker=dict(size=14, line=dict(color='white', width=1)))
+            fig.update_layout(height=max(300, 60 * timeline['Event'].nunique()), yaxis_title=None)
+            return fig
+
+        figures.render('athlete_timeline', build_athlete_timeline, (athlete_id,), data_version, use_container_width=True)
+
+        st.dataframe(career, use_container_width=True, hide_index=True)
+
+    # Footer for this section
+    st.markdown("""
+        <footer style="position: relative; bottom: 0; width: 100%; background-color: #1a237e; color: white; padding: 20px 0; text-align: center; box-shadow: 0 4px 10px rgba(0, 0, 0, 0.2); border-top: 3px solid #6a1b9a;">
+            <div style="background: linear-gradient(135deg, #1a237e, #6a1b9a); padding: 20px 0; border-radius: 12px; text-align: center;">
+                <p style="font-size: 1.2rem; font-weight: bold; color: white; margin: 0;">
+                    Developed by Umesh Pathak | 🌍 Olympic Medal Data
+                </p>
+                <p style="font-size: 1rem; color: white; margin: 5px 0;">&copy; 2025 All rights reserved.</p>
+            </div>
+        </footer>
+    """, unsafe_allow_html=True)
+
 # Top Athletes
 if user_menu == 'Top Athletes':
     st.markdown("""
@@ -674,10 +919,9 @@ if user_menu == 'Top Athletes':
     """, unsafe_allow_html=True)
 
     # Example - Display top athletes with the highest medal counts
-    top_athletes = df.groupby('Name')['Medal'].value_counts().unstack(fill_value=0)
-    top_athletes['Total Medals'] = top_athletes.sum(axis=1)
-    top_athletes_sorted = top_athletes.sort_values('Total Medals', ascending=False).head(10)
-    st.write(top_athletes_sorted[['Total Medals']])
+    with timing.span('helper.top_athletes', rows_in=athletes) as s:
+        top_athletes_sorted = s.rows(helper.top_athletes(athletes))
+    st.write(top_athletes_sorted)
 
     # Footer for this section
     st.markdown("""
@@ -701,9 +945,19 @@ if user_menu == 'Olympic Games Locations':
     </div>
     """, unsafe_allow_html=True)
 
-    # Display Olympic locations (example)
-    locations = df[['City', 'Year']].drop_duplicates().sort_values('Year')
-    st.write(locations)
+    # One row per edition from the precomputed Games table
+    st.dataframe(
+        games.drop(columns='Games'),
+        column_config={
+            'Year': st.column_config.NumberColumn('Year', format='%d'),
+            'Host': 'Host Nation',
+            'Host Medals': st.column_config.NumberColumn('Host Medals', help="Medals won by the host nation at its own Games"),
+            'Host Avg Medals (other Games)': st.column_config.NumberColumn(
+                'Host Avg (other Games)', help="Host nation's average medals at the Games it did not host"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
 
     # Footer for this section
     st.markdown("""
@@ -758,20 +1012,57 @@ if user_menu == 'Predictions':
     </div>
     """, unsafe_allow_html=True)
 
-    # Example - Predicting future Olympic medal trends (mock data)
-    st.markdown("""
-    The predictions are based on current trends and data. These include analysis of past performance, regional trends, and potential top-performing countries in future Olympics.
+    st.markdown(f"""
+    The predictions extend each country's linear Gold/Silver/Bronze trend over its last {forecast.WINDOW} Games.
+    Models for every country are fitted together once per dataset version and cached to disk.
     """)
 
-    # For illustration: Create a simple line chart with predicted medal trends (mock data)
-    predicted_years = [2028, 2032, 2036, 2040]
-    predicted_medals = [100, 110, 120, 130]
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(predicted_years, predicted_medals, marker='o', color='#FFD700', label='Predicted Gold Medals')
-    ax.set_title("Predicted Gold Medal Trends", fontsize=16)
-    ax.set_xlabel("Year", fontsize=14)
-    ax.set_ylabel("Number of Gold Medals", fontsize=14)
-    st.pyplot(fig)
+    model = load_forecast(data_version, df)
+    with st.sidebar:
+        st.title('🔮 Forecast')
+        country_list = model.regions
+        selected_country = st.selectbox(
+            'Select a Country',
+            country_list,
+            index=country_list.index('USA') if 'USA' in country_list else 0,
+            key='forecast_country'
+        )
+
+    with timing.span('forecast.predict') as s:
+        predicted = s.rows(model.predict(selected_country))
+
+    def build_predictions_line():
+        history = model.history_frame(selected_country).assign(Kind='Actual')
+        combined = pd.concat([history, predicted.assign(Kind='Forecast')]) \
+            .melt(id_vars=['Year', 'Kind'], value_vars=forecast.MEDALS, var_name='Medal', value_name='Count')
+        fig = px.line(
+            combined,
+            x='Year',
+            y='Count',
+            color='Medal',
+            line_dash='Kind',
+            markers=True,
+            color_discrete_map={'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32'},
+            template="plotly_white",
+            title=f"{selected_country}'s Medal Trend and Forecast"
+        )
+        fig.update_layout(height=500, hovermode="x unified", yaxis_title="Medals", title_x=0.5)
+        return fig
+
+    figures.render('predictions_line', build_predictions_line, (selected_country,), data_version,
+                   use_container_width=True)
+
+    st.dataframe(
+        predicted,
+        column_config={
+            'Year': st.column_config.NumberColumn('Year', format='%d'),
+            'Gold': st.column_config.NumberColumn('Gold', format='🥇 %.1f'),
+            'Silver': st.column_config.NumberColumn('Silver', format='🥈 %.1f'),
+            'Bronze': st.column_config.NumberColumn('Bronze', format='🥉 %.1f'),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
 
     # Footer for this section
     st.markdown("""
@@ -783,4 +1074,21 @@ if user_menu == 'Predictions':
                 <p style="font-size: 1rem; color: white; margin: 5px 0;">&copy; 2025 All rights reserved.</p>
             </div>
         </footer>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+# Data export: rows are streamed in chunks by service.py, since st.download_button
+# would hold the whole file in this worker's memory
+SERVICE_URL = os.environ.get('OLYMPICS_SERVICE_URL')
+with st.sidebar.expander('📥 Export data', expanded=False):
+    export_options = load_export_options(data_version, df)
+    export_year = st.selectbox('Year', export_options['Year'], key='export_year')
+    export_country = st.selectbox('Country', export_options['region'], key='export_country')
+    export_sport = st.selectbox('Sport', export_options['Sport'], key='export_sport')
+    export_format = st.radio('Format', ['csv', 'parquet'], horizontal=True, key='export_format')
+    if SERVICE_URL:
+        query = {'format': export_format, 'year': export_year, 'country': export_country, 'sport': export_sport}
+        st.markdown(f"[Download {export_format.upper()}]({SERVICE_URL.rstrip('/')}/export?{urlencode(query)})")
+    else:
+        st.caption("Start `python service.py` and set OLYMPICS_SERVICE_URL to enable streamed exports.")
+
+timing.sidebar_panel()
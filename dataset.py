@@ -0,0 +1,34 @@
+import hashlib
+import os
+
+import pandas as pd
+
+import preprocessor
+import timing
+
+EVENTS_PATH = 'athlete_events.csv'
+REGIONS_PATH = 'noc_regions.csv'
+
+
+def version(events_path=EVENTS_PATH, regions_path=REGIONS_PATH):
+    """Short fingerprint of the source files, used to key caches and ETags."""
+    h = hashlib.sha1()
+    for path in (events_path, regions_path):
+        stat = os.stat(path)
+        h.update(f'{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return h.hexdigest()[:12]
+
+
+def load(events_path=EVENTS_PATH, regions_path=REGIONS_PATH):
+    """Read and preprocess the raw CSVs, returning ``(df, version)``."""
+    data_version = version(events_path, regions_path)
+
+    with timing.span('read_csv.athlete_events') as s:
+        df = s.rows(pd.read_csv(events_path))
+    with timing.span('read_csv.noc_regions') as s:
+        region_df = s.rows(pd.read_csv(regions_path))
+
+    with timing.span('preprocessor.preprocess', rows_in=df) as s:
+        df = s.rows(preprocessor.preprocess(df, region_df))
+
+    return df, data_version
@@ -0,0 +1,83 @@
+import io
+
+import numpy as np
+
+CHUNK_ROWS = 50_000
+# query parameter -> column it filters
+FILTERS = {'year': 'Year', 'country': 'region', 'sport': 'Sport', 'season': 'Season'}
+
+
+def filter_mask(df, year=None, country=None, sport=None, season=None):
+    """Boolean mask for the dashboard filters; ``None`` or 'Overall' leaves a filter off."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in (('Year', year), ('region', country), ('Sport', sport), ('Season', season)):
+        if value is None or value == 'Overall':
+            continue
+        if column == 'Year':
+            value = int(value)
+        # Missing values (e.g. no region) never match; Arrow-backed columns would give <NA>
+        mask &= (df[column] == value).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def iter_chunks(df, mask, chunk_rows=CHUNK_ROWS):
+    """Yield the selected rows ``chunk_rows`` at a time, so at most one chunk is copied."""
+    positions = np.flatnonzero(mask)
+    if not len(positions):
+        # An empty chunk still carries the columns, so writers emit a header/schema
+        yield df.iloc[:0]
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]]
+
+
+def csv_stream(chunks):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._pending = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._pending.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._pending)
+        self._pending = []
+        return data
+
+
+def parquet_stream(chunks):
+    """Write each chunk as one Parquet row group, yielding the bytes as they are produced."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Sink()
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            # A text column that is all missing in the first chunk (e.g. Medal) would be
+            # typed null and clash with later chunks, so pin it to string up front
+            schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                for field in schema])
+            writer = pq.ParquetWriter(sink, schema)
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,52 @@
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+import timing
+
+# Figures with at least this many scatter points are drawn with WebGL instead of SVG
+WEBGL_MIN_POINTS = 1000
+
+
+def _as_webgl(trace):
+    spec = trace.to_plotly_json()
+    spec.pop('type', None)
+    try:
+        return go.Scattergl(spec)
+    except ValueError:
+        # Property that scattergl doesn't support (e.g. spline lines); keep the SVG trace
+        return trace
+
+
+def compact(fig):
+    """Return a copy of ``fig`` with dense scatter traces switched to WebGL."""
+    points = sum(len(trace.x) for trace in fig.data if trace.type == 'scatter' and trace.x is not None)
+    # Animated figures keep SVG traces; scattergl frames don't transition
+    webgl = points >= WEBGL_MIN_POINTS and not fig.frames
+
+    traces = [_as_webgl(trace) if webgl and trace.type == 'scatter' else trace for trace in fig.data]
+    return go.Figure(data=traces, layout=fig.layout, frames=fig.frames)
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _build(chart_id, params, data_version, _build_fn):
+    fig = compact(_build_fn())
+    # Sizing the payload is a full extra serialization, so only pay for it when it's recorded
+    payload_bytes = len(pio.to_json(fig, validate=False)) if timing.ENABLED else None
+    return fig, payload_bytes
+
+
+def render(chart_id, build, params=(), data_version=None, **kwargs):
+    """Draw a plotly chart, building it only when (chart_id, params, data_version) is new.
+
+    ``build`` is a zero-argument callable returning the figure; with timing enabled the span
+    records the serialized payload size so regressions per chart show up in the timing log.
+
+    Only the figure object is cached: ``st.plotly_chart`` still serializes it on every rerun
+    and sends the same number of bytes over the websocket. The WebGL switch makes dense
+    scatter plots cheaper for the browser to draw, not smaller to send.
+    """
+    with timing.span(f'render.{chart_id}') as s:
+        fig, payload_bytes = _build(chart_id, tuple(params), data_version, build)
+        s.note(payload_bytes=payload_bytes)
+        st.plotly_chart(fig, **kwargs)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import helper
+import matrices
+
+MEDALS = ['Gold', 'Silver', 'Bronze']
+CACHE_DIR = os.environ.get('OLYMPICS_FORECAST_CACHE', '.forecast_cache')
+# Trends are fitted on each country's most recent Games only
+WINDOW = 8
+GAMES_INTERVAL = 4
+# Bump when the fitting method changes, so caches written by the old method are not reused
+FIT_REVISION = 2
+
+
+class MedalForecast:
+    """Linear per-Games trend for every region and medal, fitted in one batched least-squares solve."""
+
+    def __init__(self, regions, years, history, coef):
+        self.regions = regions
+        self.years = years
+        self.history = history  # (region, year, medal) counts, NaN for Games the region missed
+        self.coef = coef        # (region, medal, [intercept, slope])
+        self._region_index = {region: i for i, region in enumerate(regions)}
+
+    @classmethod
+    def fit(cls, df, window=WINDOW):
+        regions = sorted(df['region'].dropna().unique().tolist())
+        tally = helper.compare_yearwise_medal_tally(df, regions)
+        years = sorted(df['Year'].unique().tolist())
+
+        grid = pd.MultiIndex.from_product([regions, years], names=['region', 'Year'])
+        history = tally.set_index(['region', 'Year'])[MEDALS].reindex(grid, fill_value=0) \
+            .to_numpy(dtype=float).reshape(len(regions), len(years), len(MEDALS))
+        # A Games without medals is a real zero only if the region took part in it
+        entries = df.dropna(subset=['region'])
+        attended = matrices.count_matrix(matrices.codes(entries['region'], regions),
+                                         matrices.codes(entries['Year'], years), (len(regions), len(years))) > 0
+        history[~attended] = np.nan
+
+        # Least squares weighted by attendance: every region shares the design matrix, so the
+        # per-region normal equations are built and solved as one batch
+        t = np.asarray(years[-window:], dtype=float)
+        design = np.column_stack([np.ones_like(t), t - t[-1]])
+        weights = attended[:, -window:].astype(float)
+        targets = np.nan_to_num(history[:, -window:, :])
+        gram = np.einsum('rt,ti,tj->rij', weights, design, design)
+        moments = np.einsum('rt,ti,rtm->rim', weights, design, targets)
+
+        # With fewer than two Games in the window there is no trend; hold the mean level instead
+        counts = weights.sum(axis=1)
+        coef = np.zeros((len(regions), len(MEDALS), 2))
+        coef[:, :, 0] = moments[:, 0, :] / np.maximum(counts, 1)[:, None]
+        trend = counts >= 2
+        coef[trend] = np.linalg.solve(gram[trend], moments[trend]).transpose(0, 2, 1)
+        return cls(regions, years, history, coef)
+
+    def save(self, path):
+        np.savez_compressed(path, regions=np.array(self.regions, dtype=str), years=np.array(self.years),
+                            history=self.history, coef=self.coef)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(data['regions'].tolist(), data['years'].tolist(), data['history'], data['coef'])
+
+    def future_years(self, n=4):
+        return [self.years[-1] + GAMES_INTERVAL * (i + 1) for i in range(n)]
+
+    def history_frame(self, country):
+        i = self._region_index[country]
+        frame = pd.DataFrame(self.history[i], columns=MEDALS)
+        frame.insert(0, 'Year', self.years)
+        return frame
+
+    def predict(self, country, n=4):
+        i = self._region_index[country]
+        years = self.future_years(n)
+        offsets = np.asarray(years, dtype=float) - self.years[-1]
+        predicted = self.coef[i, :, 0] + np.outer(offsets, self.coef[i, :, 1])
+        frame = pd.DataFrame(np.clip(predicted, 0, None).round(1), columns=MEDALS)
+        frame.insert(0, 'Year', years)
+        return frame
+
+
+def load_or_fit(df, data_version, cache_dir=CACHE_DIR, window=WINDOW):
+    """Fitted forecast for this dataset version and window, read from disk when it was fitted before."""
+    path = os.path.join(cache_dir, f'forecast-{data_version}-w{window}-r{FIT_REVISION}.npz')
+    if os.path.exists(path):
+        return MedalForecast.load(path)
+    model = MedalForecast.fit(df, window=window)
+    os.makedirs(cache_dir, exist_ok=True)
+    # A private temp file per writer, so concurrent workers fitting the same version
+    # can't interleave writes; the last os.replace wins with a complete file
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.npz', delete=False) as tmp:
+        model.save(tmp)
+    os.replace(tmp.name, path)
+    return model
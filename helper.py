@@ -1,5 +1,7 @@
 import numpy as np
 
+import matrices
+
 
 def fetch_medal_tally(df, year, country):
     medal_df = df.drop_duplicates(subset=['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal'])
@@ -15,9 +17,9 @@ def fetch_medal_tally(df, year, country):
         temp_df = medal_df[(medal_df['Year'] == year) & (medal_df['region'] == country)]
 
     if flag == 1:
-        x = temp_df.groupby('Year').sum()[['Gold', 'Silver', 'Bronze']].sort_values('Year').reset_index()
+        x = temp_df.groupby('Year')[['Gold', 'Silver', 'Bronze']].sum().sort_values('Year').reset_index()
     else:
-        x = temp_df.groupby('region').sum()[['Gold', 'Silver', 'Bronze']].sort_values('Gold',
+        x = temp_df.groupby('region')[['Gold', 'Silver', 'Bronze']].sum().sort_values('Gold',
                                                                                       ascending=False).reset_index()
 
     x['total'] = x['Gold'] + x['Silver'] + x['Bronze']
@@ -49,26 +51,33 @@ def data_over_time(df,col):
     return nations_over_time
 
 
-def most_successful(df, sport='Overall'):
+def most_successful(df, athletes, sport='Overall'):
     # Filter athletes with medals
-    temp_df = df.dropna(subset=['Medal']).copy()
+    temp_df = df.dropna(subset=['Medal'])
 
     # Apply sport filter if specified
     if sport != 'Overall':
         temp_df = temp_df[temp_df['Sport'] == sport]
 
-    # Aggregate medals by athlete details
+    # Aggregate medals by athlete ID, then attach names from the athlete table
     medal_counts = (
-        temp_df.groupby(['Name', 'Sport', 'region'])
+        temp_df.groupby(['ID', 'Sport'])
         .size()
         .reset_index(name='Medals')
         .sort_values('Medals', ascending=False)
         .head(15)
+        .join(athletes[['Name', 'region']], on='ID')
     )
 
     return medal_counts[['Name', 'Medals', 'Sport', 'region']]
 
 
+def top_athletes(athletes, n=10):
+    top = athletes.sort_values('Medals', ascending=False).head(n)
+    return top.set_index('Name')[['Gold', 'Silver', 'Bronze', 'Medals']] \
+        .rename(columns={'Medals': 'Total Medals'})
+
+
 def yearwise_medal_tally(df, country):
     temp_df = df.dropna(subset=['Medal'])
     temp_df = temp_df[temp_df['region'] == country]
@@ -81,18 +90,6 @@ def yearwise_medal_tally(df, country):
     }).reset_index()
 
 
-def country_event_heatmap(df, country):
-    temp_df = df.dropna(subset=['Medal'])
-    temp_df = temp_df[temp_df['region'] == country]
-
-    return temp_df.pivot_table(
-        index='Sport',
-        columns='Year',
-        values='Medal',
-        aggfunc='count'
-    ).fillna(0).astype(int)
-
-
 def most_successful_countrywise(df, country):
     temp_df = df.dropna(subset=['Medal'])
     temp_df = temp_df[temp_df['region'] == country]
@@ -105,13 +102,40 @@ def most_successful_countrywise(df, country):
         .head(10)
 
 def country_event_heatmap(df,country):
+    # For repeated lookups build a matrices.MedalCube once and slice it instead
+    temp_df = df[df['region'] == country].dropna(subset=['Medal'])
+    temp_df = temp_df.drop_duplicates(subset=matrices.MEDAL_KEYS)
+
+    return matrices.sport_year_matrix(temp_df)
+
+
+def compare_yearwise_medal_tally(df, countries):
+    # One grouped pass for every selected country instead of one pass per country
+    temp_df = df.dropna(subset=['Medal'])
+    temp_df = temp_df[temp_df['region'].isin(countries)]
+
+    return temp_df.groupby(['region', 'Year']).agg({
+        'Gold': 'sum',
+        'Silver': 'sum',
+        'Bronze': 'sum',
+        'Medal': 'count'
+    }).reset_index()
+
+
+def compare_top_athletes(df, athletes, countries, n=5):
     temp_df = df.dropna(subset=['Medal'])
-    temp_df.drop_duplicates(subset=['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal'], inplace=True)
+    temp_df = temp_df[temp_df['region'].isin(countries)]
 
-    new_df = temp_df[temp_df['region'] == country]
+    # Sport comes from the medal rows, so multi-sport athletes are listed once per sport
+    medal_counts = temp_df.groupby(['region', 'ID', 'Sport']) \
+        .size() \
+        .reset_index(name='Medals') \
+        .sort_values(['region', 'Medals'], ascending=[True, False], kind='stable') \
+        .groupby('region') \
+        .head(n) \
+        .join(athletes[['Name']], on='ID')
 
-    pt = new_df.pivot_table(index='Sport', columns='Year', values='Medal', aggfunc='count').fillna(0)
-    return pt
+    return medal_counts[['region', 'Name', 'Sport', 'Medals']]
 
 
 def most_successful_countrywise(df, country):
@@ -128,25 +152,23 @@ def most_successful_countrywise(df, country):
 
     return medal_counts[['Name', 'Sport', 'Medals']]
 
-def weight_v_height(df,sport):
-    athlete_df = df.drop_duplicates(subset=['Name', 'region'])
-    athlete_df['Medal'].fillna('No Medal', inplace=True)
-    if sport != 'Overall':
-        temp_df = athlete_df[athlete_df['Sport'] == sport]
-        return temp_df
-    else:
-        return athlete_df
-
-def men_vs_women(df):
-    athlete_df = df.drop_duplicates(subset=['Name', 'region'])
-
-    men = athlete_df[athlete_df['Sex'] == 'M'].groupby('Year').count()['Name'].reset_index()
-    women = athlete_df[athlete_df['Sex'] == 'F'].groupby('Year').count()['Name'].reset_index()
+def medalist_ages(df, medal):
+    # Age and sport at the Games the medal was won, not the athlete's debut
+    medalists = df[df['Medal'] == medal].drop_duplicates(subset=['ID', 'Games', 'Sport'])
+    return medalists[['Sport', 'Age']].dropna()
 
-    final = men.merge(women, on='Year', how='left')
-    final.rename(columns={'Name_x': 'Male', 'Name_y': 'Female'}, inplace=True)
-
-    final.fillna(0, inplace=True)
+def weight_v_height(athletes,sport):
+    if sport != 'Overall':
+        athletes = athletes[athletes['Sport'] == sport]
+    return athletes.assign(Medal=athletes['Medal'].fillna('No Medal'))
+
+def men_vs_women(athletes):
+    # Athletes are counted in the year of their first Games
+    final = athletes.groupby(['Year', 'Sex']).size().unstack(fill_value=0)
+    final = final.rename(columns={'M': 'Male', 'F': 'Female'}) \
+        .reindex(columns=['Male', 'Female'], fill_value=0) \
+        .rename_axis(columns=None) \
+        .reset_index()
 
     return final
 
@@ -0,0 +1,129 @@
+"""Simulate concurrent dashboard sessions against app.py and report rerun latency.
+
+Each session is a headless AppTest run in its own worker process; AppTest drives a
+process-global script runner, so sessions can't share a process. Caches are therefore
+per session, which makes this a measure of per-session rerun cost rather than of cache
+sharing inside one Streamlit server::
+
+    python loadtest.py --sessions 8 --duration 60 --output before.json
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+MENUS = ('Medal Tally', 'Overall Analysis', 'Country-wise Analysis', 'Athlete-wise Analysis')
+
+
+def _rss_mb():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return round(psutil.Process().memory_info().rss / 2 ** 20, 1)
+
+
+def run_session(session, duration, timeout, seed):
+    from streamlit.testing.v1 import AppTest
+
+    latencies, errors = [], []
+    rng = random.Random(seed * 1000 + session)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def timed_run(step, into=latencies):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            errors.append(1)
+            return
+        into.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            errors.append(1)
+
+    # The first run parses the data and fills every cache_resource; it is reported on its
+    # own so the percentiles and throughput measure rerun cost only
+    cold = []
+    timed_run(at.run, into=cold)
+    began = time.perf_counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        menu = rng.choice(MENUS)
+        timed_run(lambda: at.sidebar.radio[0].set_value(menu).run())
+        # Then change one of the page's own filters at random
+        boxes = list(at.selectbox)
+        if boxes:
+            box = rng.choice(boxes)
+            timed_run(lambda: box.select_index(rng.randrange(len(box.options))).run())
+
+    return {
+        'session': session,
+        'pid': os.getpid(),
+        'elapsed_s': time.perf_counter() - began,
+        'rss_mb': _rss_mb(),
+        'cold_start_ms': round(cold[0], 1) if cold else None,
+        'latencies_ms': latencies,
+        'errors': len(errors),
+    }
+
+
+def summarize(results, args):
+    latencies = np.array([ms for result in results for ms in result['latencies_ms']])
+    elapsed = max(result['elapsed_s'] for result in results)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (None,) * 3
+    cold = [result['cold_start_ms'] for result in results if result['cold_start_ms'] is not None]
+    return {
+        'config': {
+            'sessions': args.sessions,
+            'duration_s': args.duration,
+            'seed': args.seed,
+        },
+        'reruns': int(len(latencies)),
+        'errors': sum(result['errors'] for result in results),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': None if p50 is None else round(float(p50), 1),
+            'p95': None if p95 is None else round(float(p95), 1),
+            'p99': None if p99 is None else round(float(p99), 1),
+            'max': round(float(latencies.max()), 1) if len(latencies) else None,
+        },
+        'cold_start_ms': {
+            'p50': round(float(np.median(cold)), 1) if cold else None,
+            'max': max(cold) if cold else None,
+        },
+        'sessions': [{'session': r['session'], 'pid': r['pid'], 'rss_mb': r['rss_mb'],
+                      'cold_start_ms': r['cold_start_ms']} for r in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4, help='concurrent sessions, one process each')
+    parser.add_argument('--duration', type=float, default=30, help='seconds each session clicks for')
+    parser.add_argument('--timeout', type=float, default=120, help='per-rerun timeout in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    session_args = [(i, args.duration, args.timeout, args.seed) for i in range(args.sessions)]
+    if args.sessions == 1:
+        results = [run_session(*session_args[0])]
+    else:
+        with ProcessPoolExecutor(args.sessions) as pool:
+            results = list(pool.map(run_session, *zip(*session_args)))
+
+    report = json.dumps(summarize(results, args), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# A team medal is counted once, however many athletes shared it
+MEDAL_KEYS = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
+
+
+def codes(values, categories):
+    """Integer position of each value in ``categories`` (-1 where absent)."""
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+
+def count_matrix(row_codes, col_codes, shape):
+    """Dense 2-D count of (row, col) code pairs via a single bincount."""
+    flat = np.bincount(row_codes * shape[1] + col_codes, minlength=shape[0] * shape[1])
+    return flat.reshape(shape)
+
+
+def _frame(counts, sports, years, trim):
+    index = pd.Index(sports, name='Sport')
+    columns = pd.Index(years, name='Year')
+    if trim:
+        rows = counts.any(axis=1)
+        cols = counts.any(axis=0)
+        counts = counts[rows][:, cols]
+        index = index[rows]
+        columns = columns[cols]
+    return pd.DataFrame(counts, index=index, columns=columns)
+
+
+def sport_year_matrix(df, sports=None, years=None, trim=True):
+    """Sport x Year row counts, equivalent to ``pivot_table(aggfunc='count').fillna(0).astype(int)``."""
+    if sports is None:
+        sports = sorted(df['Sport'].unique().tolist())
+    if years is None:
+        years = sorted(df['Year'].unique().tolist())
+    counts = count_matrix(codes(df['Sport'], sports), codes(df['Year'], years), (len(sports), len(years)))
+    return _frame(counts, sports, years, trim)
+
+
+def event_matrix(df):
+    """Number of distinct events per sport and Games, for the Sport Evolution Matrix."""
+    return sport_year_matrix(df.drop_duplicates(['Year', 'Sport', 'Event']))
+
+
+class MedalCube:
+    """Region x Sport x Year medal counts on fixed axes, so any country's heatmap is a slice."""
+
+    def __init__(self, counts, regions, sports, years):
+        self.counts = counts
+        self.regions = regions
+        self.sports = sports
+        self.years = years
+        self._region_index = {region: i for i, region in enumerate(regions)}
+
+    @classmethod
+    def from_frame(cls, df):
+        medals = df.dropna(subset=['Medal', 'region']).drop_duplicates(subset=MEDAL_KEYS)
+        regions = sorted(medals['region'].unique().tolist())
+        sports = sorted(medals['Sport'].unique().tolist())
+        years = sorted(medals['Year'].unique().tolist())
+
+        r = codes(medals['region'], regions)
+        s = codes(medals['Sport'], sports)
+        y = codes(medals['Year'], years)
+        shape = (len(regions), len(sports), len(years))
+        flat = np.bincount((r * shape[1] + s) * shape[2] + y, minlength=int(np.prod(shape)))
+        return cls(flat.reshape(shape), regions, sports, years)
+
+    def sport_totals(self, countries):
+        """Region x Sport medal totals for several countries from one fancy-indexed slice."""
+        known = sorted(country for country in countries if country in self._region_index)
+        counts = self.counts[[self._region_index[country] for country in known]].sum(axis=2)
+        totals = pd.DataFrame(counts, index=pd.Index(known, name='region'),
+                              columns=pd.Index(self.sports, name='Sport'))
+        return totals.loc[:, totals.any(axis=0)]
+
+    def heatmap(self, country, trim=True):
+        i = self._region_index.get(country)
+        if i is None:
+            return _frame(np.zeros((0, 0), dtype=np.int64), [], [], trim=False)
+        return _frame(self.counts[i], self.sports, self.years, trim)
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+import matrices
+
 def preprocess(df,region_df):
     # filtering for summer olympics
     df = df[df['Season'] == 'Summer']
@@ -9,4 +12,83 @@ def preprocess(df,region_df):
     df.drop_duplicates(inplace=True)
     # one hot encoding medals
     df = pd.concat([df, pd.get_dummies(df['Medal'])], axis=1)
-    return df
\ No newline at end of file
+    return df
+
+
+MEDAL_RANK = {'Bronze': 1, 'Silver': 2, 'Gold': 3}
+
+
+def build_athletes(df):
+    """One row per athlete ID: attributes from their first Games, best medal and medal totals."""
+    first = df.loc[df.groupby('ID')['Year'].idxmin(),
+                   ['ID', 'Name', 'Sex', 'Age', 'Height', 'Weight', 'NOC', 'region', 'Sport', 'Year']]
+    athletes = first.set_index('ID')
+    athletes = athletes.join(df.groupby('ID')[['Gold', 'Silver', 'Bronze']].sum().astype(int))
+    athletes['Medals'] = athletes['Gold'] + athletes['Silver'] + athletes['Bronze']
+
+    best = df['Medal'].map(MEDAL_RANK).groupby(df['ID']).max()
+    athletes['Medal'] = best.map({rank: medal for medal, rank in MEDAL_RANK.items()})
+    return athletes
+
+
+# Host nation of each Summer Games city, using the region names from noc_regions.csv
+HOST_REGIONS = {
+    'Athina': 'Greece', 'Paris': 'France', 'St. Louis': 'USA', 'London': 'UK', 'Stockholm': 'Sweden',
+    'Antwerpen': 'Belgium', 'Amsterdam': 'Netherlands', 'Los Angeles': 'USA', 'Berlin': 'Germany',
+    'Helsinki': 'Finland', 'Melbourne': 'Australia', 'Roma': 'Italy', 'Tokyo': 'Japan',
+    'Mexico City': 'Mexico', 'Munich': 'Germany', 'Montreal': 'Canada', 'Moskva': 'Russia',
+    'Seoul': 'South Korea', 'Barcelona': 'Spain', 'Atlanta': 'USA', 'Sydney': 'Australia',
+    'Beijing': 'China', 'Rio de Janeiro': 'Brazil',
+}
+
+
+def build_games(df):
+    """One row per Games edition: host, participation counts and how the host nation fared."""
+    grouped = df.groupby('Games')
+    games = pd.DataFrame({
+        'Year': grouped['Year'].first(),
+        'Season': grouped['Season'].first(),
+        'City': grouped['City'].agg(lambda cities: ', '.join(cities.unique())),
+        'Nations': grouped['region'].nunique(),
+        'Athletes': grouped['ID'].nunique(),
+        'Sports': grouped['Sport'].nunique(),
+        'Events': grouped['Event'].nunique(),
+    })
+
+    medals = df.dropna(subset=['Medal']).drop_duplicates(subset=matrices.MEDAL_KEYS)
+    games['Medals'] = medals.groupby('Games').size().reindex(games.index, fill_value=0)
+
+    # Editions split across cities (1956) are credited to the city with most entries
+    primary_city = grouped['City'].agg(lambda cities: cities.value_counts().idxmax())
+    games['Host'] = primary_city.map(HOST_REGIONS)
+
+    # Medals per nation per Games, 0 for Games entered without winning
+    entries = df[['Games', 'region']].dropna().drop_duplicates()
+    tally = medals.groupby(['Games', 'region']).size()
+    entries['Medals'] = tally.reindex(pd.MultiIndex.from_frame(entries), fill_value=0).to_numpy()
+    by_region = entries.groupby('region')
+
+    host_medals, host_average = [], []
+    for edition, host in zip(games.index, games['Host']):
+        if host not in by_region.groups:
+            host_medals.append(np.nan)
+            host_average.append(np.nan)
+            continue
+        history = by_region.get_group(host).set_index('Games')['Medals']
+        host_medals.append(history.get(edition, np.nan))
+        others = history.drop(edition, errors='ignore')
+        host_average.append(others.mean() if len(others) else np.nan)
+    games['Host Medals'] = host_medals
+    games['Host Avg Medals (other Games)'] = np.round(host_average, 1)
+
+    return games.sort_values('Year').reset_index()
+
+
+def dataset_totals(df):
+    """Distinct sports, events, nations and athletes over all editions."""
+    return {
+        'Sports': df['Sport'].nunique(),
+        'Events': df['Event'].nunique(),
+        'Nations': df['region'].nunique(),
+        'Athletes': df['ID'].nunique(),
+    }
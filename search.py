@@ -0,0 +1,63 @@
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+PROFILE_COLUMNS = ['Year', 'Games', 'City', 'Sport', 'Event', 'Team', 'Age', 'Medal']
+
+
+def normalize(text):
+    """Lower-case, accent-free, punctuation-free form used for both keys and queries."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r'[^\w\s]', ' ', text.casefold())
+    return ' '.join(text.split())
+
+
+class AthleteIndex:
+    """Prefix search over athlete names plus row offsets into the event frame per athlete ID."""
+
+    def __init__(self, df, athletes):
+        self.df = df
+        self.athletes = athletes
+
+        # Index every word-suffix of the name so 'phelps' finds 'Michael Fred Phelps, II'
+        entries = []
+        for athlete_id, name in zip(athletes.index.tolist(), athletes['Name'].tolist()):
+            words = normalize(name).split()
+            for i in range(len(words)):
+                entries.append((' '.join(words[i:]), athlete_id))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.ids = [athlete_id for _, athlete_id in entries]
+
+        # Rows of one athlete are a contiguous slice of `order`
+        ids = df['ID'].to_numpy()
+        self.order = np.argsort(ids, kind='stable')
+        self.sorted_ids = ids[self.order]
+
+    def suggest(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        found = []
+        i = bisect.bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(found) < limit:
+            if self.ids[i] not in found:
+                found.append(self.ids[i])
+            i += 1
+        return found
+
+    def label(self, athlete_id):
+        row = self.athletes.loc[athlete_id]
+        return f"{row['Name']} ({row['region']}, {row['Sport']}, {row['Year']})"
+
+    def rows(self, athlete_id):
+        lo = np.searchsorted(self.sorted_ids, athlete_id, side='left')
+        hi = np.searchsorted(self.sorted_ids, athlete_id, side='right')
+        return self.df.iloc[self.order[lo:hi]]
+
+    def profile(self, athlete_id):
+        """Every event entry of the athlete, in chronological order."""
+        return self.rows(athlete_id)[PROFILE_COLUMNS].sort_values(['Year', 'Event']).reset_index(drop=True)
@@ -0,0 +1,258 @@
+"""Headless JSON/Arrow API over the helper aggregates.
+
+Run with ``python service.py --port 8600``. Every endpoint answers JSON by default and an
+Arrow IPC stream for ``?format=arrow`` (or ``Accept: application/vnd.apache.arrow.stream``).
+Responses carry an ETag derived from the dataset version, so clients can revalidate with
+``If-None-Match`` and get a 304 without the body being rebuilt. The version is re-checked
+every ``--reload-interval`` seconds and a changed dataset is loaded in the background.
+With ``OLYMPICS_SHARED_DIR`` set, the service attaches to the frame published by
+``shared.py publish`` instead of parsing the CSVs itself.
+
+``/export?format=csv|parquet&year=&country=&sport=&season=`` streams the matching raw rows.
+"""
+import argparse
+import collections
+import functools
+import hashlib
+import io
+
+import tornado.httpserver
+import tornado.ioloop
+import tornado.web
+
+import dataset
+import export
+import helper
+import matrices
+import preprocessor
+import shared
+import timing
+
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+MAX_RESPONSES = 8192
+
+# Everything one dataset version serves from, swapped as a whole so an in-flight request
+# never mixes two versions
+Snapshot = collections.namedtuple('Snapshot', ['df', 'version', 'medal_cube', 'athletes'])
+
+snapshot = None
+# (endpoint, params, format, version) -> body; only touched from the IOLoop thread
+_responses = {}
+
+
+def _parse_year(value):
+    if value == 'Overall':
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise tornado.web.HTTPError(400, reason=f"Invalid year: {value!r}")
+
+
+def _medal_tally(data, params):
+    return helper.fetch_medal_tally(data.df, _parse_year(params.get('year', 'Overall')),
+                                    params.get('country', 'Overall'))
+
+
+def _yearwise_medal_tally(data, params):
+    return helper.yearwise_medal_tally(data.df, params['country'])
+
+
+def _most_successful(data, params):
+    return helper.most_successful(data.df, data.athletes, params.get('sport', 'Overall'))
+
+
+def _men_vs_women(data, params):
+    return helper.men_vs_women(data.athletes)
+
+
+def _participating_nations(data, params):
+    return helper.participating_nations_over_time(data.df)
+
+
+def _country_event_heatmap(data, params):
+    heatmap = data.medal_cube.heatmap(params['country'])
+    heatmap.columns = heatmap.columns.astype(str)
+    return heatmap.reset_index()
+
+
+# endpoint -> (query builder, required query parameters, optional query parameters)
+ENDPOINTS = {
+    'medal-tally': (_medal_tally, (), ('year', 'country')),
+    'yearwise-medal-tally': (_yearwise_medal_tally, ('country',), ()),
+    'most-successful': (_most_successful, (), ('sport',)),
+    'men-vs-women': (_men_vs_women, (), ()),
+    'participating-nations': (_participating_nations, (), ()),
+    'country-event-heatmap': (_country_event_heatmap, ('country',), ()),
+}
+
+
+def _to_json(frame):
+    return frame.to_json(orient='records').encode('utf-8')
+
+
+def _to_arrow(frame):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def etag(endpoint, params, fmt, version):
+    return '"' + hashlib.sha1(f'{version}:{endpoint}:{params}:{fmt}'.encode()).hexdigest()[:16] + '"'
+
+
+def render(endpoint, params, fmt, data):
+    """Build and serialize one response body from ``data``."""
+    query = ENDPOINTS[endpoint][0]
+    with timing.span(f'service.{endpoint}', rows_in=data.df) as s:
+        frame = s.rows(query(data, dict(params)))
+    return _to_arrow(frame) if fmt == 'arrow' else _to_json(frame)
+
+
+def load_snapshot(version=None):
+    """Load (or attach to) the dataset and build the tables the endpoints query."""
+    if shared.SHARED_DIR:
+        df, version = shared.attach(version=version)
+    else:
+        df, version = dataset.load()
+    return Snapshot(df, version, matrices.MedalCube.from_frame(df), preprocessor.build_athletes(df))
+
+
+def current_version():
+    return shared.current_version() if shared.SHARED_DIR else dataset.version()
+
+
+_reloading = False
+
+
+async def refresh():
+    """Swap in a freshly loaded snapshot when the data version has moved on."""
+    global snapshot, _reloading
+    if _reloading:
+        return
+    try:
+        version = current_version()
+    except OSError:
+        # Mid-publish or CSVs being replaced; keep serving the current snapshot
+        return
+    if version == snapshot.version:
+        return
+    _reloading = True
+    try:
+        snapshot = await tornado.ioloop.IOLoop.current().run_in_executor(None, load_snapshot, version)
+        _responses.clear()
+    finally:
+        _reloading = False
+
+
+class QueryHandler(tornado.web.RequestHandler):
+    def compute_etag(self):
+        # ETags are computed from the dataset version in get(), not by hashing the body
+        return None
+
+    async def get(self, endpoint):
+        if endpoint not in ENDPOINTS:
+            raise tornado.web.HTTPError(404, reason=f"Unknown endpoint: {endpoint}")
+        _, required, optional = ENDPOINTS[endpoint]
+        # get_query_argument raises MissingArgumentError (a 400) for absent required parameters
+        params = tuple((name, self.get_query_argument(name)) for name in required)
+        params += tuple((name, self.get_query_argument(name)) for name in optional
+                        if self.get_query_argument(name, None) is not None)
+
+        fmt = self.get_query_argument('format', None)
+        if fmt is None:
+            fmt = 'arrow' if ARROW_MIME in self.request.headers.get('Accept', '') else 'json'
+        if fmt not in ('json', 'arrow'):
+            raise tornado.web.HTTPError(400, reason=f"Unknown format: {fmt}")
+
+        data = snapshot
+        key = (endpoint, params, fmt, data.version)
+        tag = etag(*key)
+        self.set_header('ETag', tag)
+        self.set_header('Cache-Control', 'no-cache')
+        # The ETag depends only on the request and version, so revalidation never builds the body
+        if tag in self.request.headers.get('If-None-Match', ''):
+            self.set_status(304)
+            return
+
+        body = _responses.get(key)
+        if body is None:
+            # Build misses on the executor so a slow aggregate doesn't stall the other requests
+            body = await tornado.ioloop.IOLoop.current().run_in_executor(None, render, endpoint, params, fmt, data)
+            if data is snapshot:
+                if len(_responses) >= MAX_RESPONSES:
+                    _responses.pop(next(iter(_responses)))
+                _responses[key] = body
+        self.set_header('Content-Type', ARROW_MIME if fmt == 'arrow' else 'application/json')
+        self.write(body)
+
+
+class ExportHandler(tornado.web.RequestHandler):
+    """Stream the rows matching the dashboard filters as CSV or Parquet, one chunk at a time."""
+
+    async def get(self):
+        fmt = self.get_query_argument('format', 'csv')
+        if fmt not in ('csv', 'parquet'):
+            raise tornado.web.HTTPError(400, reason=f"Unknown format: {fmt}")
+        filters = {name: self.get_query_argument(name, None) for name in export.FILTERS}
+        data = snapshot
+        loop = tornado.ioloop.IOLoop.current()
+        try:
+            mask = await loop.run_in_executor(None, functools.partial(export.filter_mask, data.df, **filters))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason=f"Invalid year: {filters['year']!r}")
+
+        chunks = export.iter_chunks(data.df, mask)
+        stream = export.parquet_stream(chunks) if fmt == 'parquet' else export.csv_stream(chunks)
+        self.set_header('Content-Type', 'application/vnd.apache.parquet' if fmt == 'parquet' else 'text/csv')
+        self.set_header('Content-Disposition', f'attachment; filename="olympics-{data.version}.{fmt}"')
+        while True:
+            # Encoding a chunk takes hundreds of ms, so it runs on the executor, not the loop
+            piece = await loop.run_in_executor(None, next, stream, None)
+            if piece is None:
+                break
+            self.write(piece)
+            # Waiting for each chunk to drain bounds memory and yields to other requests
+            await self.flush()
+
+
+class VersionHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({'version': snapshot.version, 'endpoints': sorted(ENDPOINTS)})
+
+
+def make_app():
+    return tornado.web.Application([
+        (r'/', VersionHandler),
+        (r'/export', ExportHandler),
+        (r'/([a-z-]+)', QueryHandler),
+    ])
+
+
+def main():
+    global snapshot
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--processes', type=int, default=1,
+                        help='worker processes to fork (0 = one per CPU)')
+    parser.add_argument('--reload-interval', type=float, default=5,
+                        help='seconds between checks for a new dataset version')
+    args = parser.parse_args()
+
+    # Load before forking so every worker shares the parent's pages copy-on-write
+    snapshot = load_snapshot(shared.current_version() if shared.SHARED_DIR else None)
+
+    server = tornado.httpserver.HTTPServer(make_app())
+    server.bind(args.port)
+    server.start(args.processes)
+    # Each forked worker polls for new versions on its own loop
+    tornado.ioloop.PeriodicCallback(refresh, args.reload_interval * 1000).start()
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == '__main__':
+    main()
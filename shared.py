@@ -0,0 +1,79 @@
+"""Publish the preprocessed frame once and let every worker memory-map it.
+
+A single loader runs ``python shared.py publish --dir /dev/shm/olympics``; Streamlit workers
+started with ``OLYMPICS_SHARED_DIR=/dev/shm/olympics`` then attach to the published Arrow file
+instead of parsing the CSVs themselves. Pages of the mapped file live in the OS page cache
+and are shared by all processes on the host.
+"""
+import argparse
+import glob
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+import dataset
+
+SHARED_DIR = os.environ.get('OLYMPICS_SHARED_DIR')
+POINTER = 'CURRENT'
+
+
+def _data_path(directory, version):
+    return os.path.join(directory, f'olympics-{version}.arrow')
+
+
+def publish(df, version, directory, keep=2):
+    """Write ``df`` as an uncompressed Arrow IPC file and atomically point CURRENT at it."""
+    os.makedirs(directory, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    path = _data_path(directory, version)
+    tmp = path + '.tmp'
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+    pointer_tmp = os.path.join(directory, POINTER + '.tmp')
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(directory, POINTER))
+
+    # Workers still holding an older mapping keep it valid after unlink
+    published = sorted(glob.glob(_data_path(directory, '*')), key=os.path.getmtime)
+    for old in published[:-keep]:
+        os.remove(old)
+    return path
+
+
+def current_version(directory=SHARED_DIR):
+    with open(os.path.join(directory, POINTER)) as f:
+        return f.read().strip()
+
+
+def attach(directory=SHARED_DIR, version=None):
+    """Memory-map the published frame read-only, returning ``(df, version)``."""
+    if version is None:
+        version = current_version(directory)
+    source = pa.memory_map(_data_path(directory, version), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    # Arrow-backed dtypes keep every column, strings included, as a view over the mapped
+    # buffers; plain to_pandas() would copy text into per-worker Python objects
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    return df, version
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish the preprocessed Olympics dataset')
+    parser.add_argument('command', choices=['publish'])
+    parser.add_argument('--dir', default=SHARED_DIR, required=SHARED_DIR is None)
+    parser.add_argument('--keep', type=int, default=2, help='published versions to retain')
+    args = parser.parse_args()
+
+    df, version = dataset.load()
+    path = publish(df, version, args.dir, keep=args.keep)
+    print(f'Published {len(df)} rows as version {version} to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+# End points of the 'Blues' gradient previously produced by Styler.background_gradient
+GRADIENT_LOW = np.array([247, 251, 255])
+GRADIENT_HIGH = np.array([8, 48, 107])
+
+
+def gradient_css(values, vmin, vmax):
+    """Background/text CSS for each value, interpolated in one vectorized step."""
+    span = (vmax - vmin) or 1
+    t = np.clip((np.asarray(values, dtype=float) - vmin) / span, 0, 1)
+    rgb = np.rint(GRADIENT_LOW + t[:, None] * (GRADIENT_HIGH - GRADIENT_LOW)).astype(int)
+    return [f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'white' if x > 0.5 else '#1a237e'}"
+            for (r, g, b), x in zip(rgb.tolist(), t.tolist())]
+
+
+def sorted_page(frame, sort_by, ascending, page, page_size):
+    start = page * page_size
+    return frame.sort_values(sort_by, ascending=ascending, kind='stable').iloc[start:start + page_size]
+
+
+def paged_table(frame, key, gradient_column, page_size=20, column_config=None):
+    """Sort and page ``frame`` on the server and only style the rows that are shown.
+
+    The gradient is scaled against the whole column so colours stay comparable across pages.
+    Tables with a Year column open in chronological order, others by ``gradient_column``.
+    """
+    columns = frame.columns.tolist()
+    chronological = 'Year' in columns
+    default = 'Year' if chronological else gradient_column
+    # Separate widget state per default, so switching between a yearly and a per-country
+    # table doesn't carry the other table's sort over
+    key = f'{key}_{default.lower()}'
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_by = col1.selectbox('Sort by', columns, index=columns.index(default), key=f'{key}_sort')
+    ascending = col2.checkbox('Ascending', value=chronological, key=f'{key}_ascending')
+    pages = max(1, math.ceil(len(frame) / page_size))
+    page = col3.number_input('Page', min_value=1, max_value=pages, value=1, key=f'{key}_page') - 1
+
+    visible = sorted_page(frame, sort_by, ascending, page, page_size)
+    colors = gradient_css(visible[gradient_column], frame[gradient_column].min(), frame[gradient_column].max())
+    styled = visible.style.apply(lambda _: colors, subset=[gradient_column])
+
+    st.dataframe(styled, column_config=column_config, use_container_width=True, hide_index=True)
+    first = page * page_size + 1 if len(frame) else 0
+    st.caption(f"Showing {first}–{page * page_size + len(visible)} of {len(frame)} · page {page + 1} of {pages}")
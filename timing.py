@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import psutil
+    _process = psutil.Process()
+except ImportError:
+    _process = None
+
+# Set OLYMPICS_TIMING=1 to record spans; OLYMPICS_TIMING_LOG=<path> to also append them as JSON lines
+ENABLED = os.environ.get('OLYMPICS_TIMING', '') not in ('', '0')
+LOG_PATH = os.environ.get('OLYMPICS_TIMING_LOG')
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def _rss():
+    if _process is None:
+        return None
+    return _process.memory_info().rss
+
+
+def _count_rows(obj):
+    if obj is None:
+        return None
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+class _NullSpan:
+    """Stand-in returned while timing is disabled, so instrumented code costs one attribute lookup."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def rows(self, obj):
+        return obj
+
+    def note(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in if isinstance(rows_in, int) else _count_rows(rows_in)
+        self.rows_out = None
+        self.fields = {}
+
+    def __enter__(self):
+        self._rss = _rss()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        rss = _rss()
+        record = {
+            'ts': time.time(),
+            'span': self.name,
+            'wall_ms': round(wall_ms, 3),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'mem_delta_kb': None if rss is None or self._rss is None else (rss - self._rss) // 1024,
+            'error': None if exc_type is None else exc_type.__name__,
+            **self.fields,
+        }
+        collected = getattr(_local, 'records', None)
+        if collected is not None:
+            collected.append(record)
+        if LOG_PATH:
+            _write(record)
+        return False
+
+    def rows(self, obj):
+        """Record the row count of a stage's result and hand the result back."""
+        self.rows_out = _count_rows(obj)
+        return obj
+
+    def note(self, **fields):
+        """Attach extra measurements (e.g. ``payload_bytes``) to this span's record."""
+        self.fields.update(fields)
+
+
+def span(name, rows_in=None):
+    """Time a block: ``with timing.span('helper.x', rows_in=df) as s: out = s.rows(helper.x(df))``."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, rows_in)
+
+
+def enable(log_path=None):
+    global ENABLED, LOG_PATH
+    ENABLED = True
+    if log_path is not None:
+        LOG_PATH = log_path
+
+
+def records():
+    """Spans recorded on this thread since its last ``reset()``."""
+    return getattr(_local, 'records', None) or []
+
+
+def reset():
+    """Start collecting spans on this thread (Streamlit runs each session's script in its own).
+
+    Threads that never call this, such as service.py's executor, only go to the log file,
+    so long-running callers don't accumulate records in memory.
+    """
+    _local.records = []
+
+
+def _write(record):
+    line = json.dumps(record)
+    with _log_lock:
+        with open(LOG_PATH, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def sidebar_panel():
+    """Show the spans recorded during the current rerun in the Streamlit sidebar."""
+    if not ENABLED:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    spans = records()
+    with st.sidebar.expander('⏱️ Timing', expanded=False):
+        if not spans:
+            st.caption('No spans recorded in this rerun.')
+            return
+        table = pd.DataFrame(spans).drop(columns=['ts', 'error'])
+        st.caption(f"Total: {table['wall_ms'].sum():.1f} ms across {len(table)} spans")
+        st.dataframe(table, hide_index=True, use_container_width=True)